@@ -3,133 +3,237 @@ Lambda handlers for HPD Pricing Integration
 Replaces the FastAPI endpoints with individual Lambda functions
 """
 
-import json
+import asyncio
+import functools
+import logging
 import os
-import boto3
+import reprlib
+import time
+import orjson
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 
 # Import the existing HPD modules
-from hpd.api import get_full_catalog
-from hpd.pricing import compute_priced_catalog
-from hpd.toolswift import upload_and_return_url, start_toolswift_upload_with_json
+from hpd.aio import run_sync
+from hpd.api import aget_catalog_columns
+from hpd.jsonstream import JsonArrayReader
+from hpd.models import catalog_size
+from hpd.pricing import iter_priced_rows
+from hpd.toolswift import aprewarm_toolswift, astart_toolswift_upload_with_json
 from hpd.email import send_email, notify_integration_started, notify_error
 
+# Lambda's runtime already installs a root handler (making basicConfig a
+# no-op there); locally this gives the messages somewhere to go
+logging.basicConfig(format="%(levelname)s %(message)s")
+logger = logging.getLogger("hpd")
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+# Bounded repr for logging API responses: caps each string and container at
+# a fixed size instead of stringifying the whole response and slicing it
+_SUMMARY_REPR = reprlib.Repr()
+_SUMMARY_REPR.maxlevel = 3
+_SUMMARY_REPR.maxdict = 20
+_SUMMARY_REPR.maxlist = 20
+_SUMMARY_REPR.maxstring = 200
+_SUMMARY_REPR.maxother = 200
+
+
+class _Capped:
+    """Defers a size-bounded repr of obj until the log record is emitted."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return _SUMMARY_REPR.repr(self.obj)
+
+
+# Environment is parsed once per container; a missing bucket fails at import
+# (cold start) rather than part-way through a job
+S3_BUCKET = os.environ['S3_BUCKET_NAME']
+STACK_NAME = os.environ.get('AWS_LAMBDA_FUNCTION_NAME', '').replace('-StatusFunction', '')
+RULE_NAME = f"{STACK_NAME}-ScheduledJobRule"
+
+# boto3 is imported on first use so handlers that never touch AWS (health,
+# test-email) skip its import and botocore model loading on cold start.
+# Clients are cached per container so warm invocations reuse the parsed
+# service models and keep-alive connection pools.
+@functools.lru_cache(maxsize=None)
+def _s3():
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client('s3', config=Config(
+        max_pool_connections=32,
+        tcp_keepalive=True,
+        retries={'mode': 'adaptive', 'max_attempts': 5},
+    ))
+
+
+@functools.lru_cache(maxsize=None)
+def _events():
+    import boto3
+
+    return boto3.client('events')
+
+
+@functools.lru_cache(maxsize=None)
+def _catalog_transfer_config():
+    from boto3.s3.transfer import TransferConfig
+
+    # Parts are read from the encoding stream in order and uploaded
+    # concurrently. A non-seekable stream buffers every in-flight part, so
+    # concurrency is capped to bound memory at ~max_concurrency * chunksize.
+    return TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=8 * 1024 * 1024,
+        max_concurrency=4,
+        use_threads=True,
+    )
+
+
+# Same for every response and never mutated, so built once
+_CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
+    'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
+}
+
 
 def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     """Create a standardized API Gateway response"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
-            'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
-        },
-        'body': json.dumps(body)
+        'headers': _CORS_HEADERS,
+        'body': orjson.dumps(body).decode()
     }
 
 
 def health_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Health check endpoint - replaces GET /health"""
-    print("[API] /health called.")
+    logger.info("[API] /health called.")
     return create_response(200, {"status": "ok"})
 
 
 def run_job() -> Dict[str, Any]:
+    """Run the job on the shared event loop (Lambda handlers are synchronous)"""
+    return run_sync(run_job_async())
+
+
+async def _notify_started(count: int) -> None:
+    try:
+        await asyncio.to_thread(notify_integration_started, count)
+        logger.info("[Notify] Integration start email sent.")
+    except Exception as e:
+        logger.error("[Notify] Failed to send start email: %s", e)
+
+
+async def run_job_async() -> Dict[str, Any]:
     """Core business logic - same as original run_job function"""
-    print("[Job] run_job started.")
+    logger.info("[Job] run_job started.")
     
     try:
-        # Get catalog from HPD API
-        products = get_full_catalog()  
-        print(f"[Job] Retrieved catalog. count={len(products)}")
+        # Get catalog from HPD API, as columns for vectorized pricing
+        catalog = await aget_catalog_columns()
+        count = catalog_size(catalog)
+        logger.info("[Job] Retrieved catalog. count=%s", count)
 
-        # Compute pricing
-        priced = compute_priced_catalog(products)
-        print(f"[Job] Computed priced catalog. count={len(priced)}")
+        # Pricing is computed lazily while the upload streams it out
+        logger.info("[Job] Pricing catalog. count=%s", count)
 
         # Log first product for debugging
-        if priced:
-            first_product = priced[0]
-            print(f"[Job] First product: {first_product}")
+        if count and logger.isEnabledFor(logging.DEBUG):
+            # Price a one-row slice; the upload prices the full catalog
+            first_product = next(iter_priced_rows({k: v[:1] for k, v in catalog.items()}))
+            logger.debug("[Job] First product: %r", first_product)
 
-        # Send integration started email
-        try:
-            notify_integration_started(len(priced))
-            print("[Notify] Integration start email sent.")
-        except Exception as e:
-            print(f"[Notify] Failed to send start email: {e}")
+        # Send integration started email, overlapping with the upload below
+        notify_task = asyncio.create_task(_notify_started(count))
 
         # Upload to S3 and get URL for Toolswift
+        s3_key = None
+        timestamp = None
         try:
-            print("[Job] Uploading priced catalog to S3...")
+            logger.info("[Job] Uploading priced catalog to S3...")
             
             # Upload to S3 instead of file-processor
-            s3_client = boto3.client('s3')
-            bucket_name = os.environ['S3_BUCKET_NAME']
+            s3_client = _s3()
+            bucket_name = S3_BUCKET
             
             # Create filename with timestamp
             timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
             s3_key = f"pricing_data/priced_catalog_{timestamp}.json"
             
-            # Upload JSON to S3
-            s3_client.put_object(
-                Bucket=bucket_name,
-                Key=s3_key,
-                Body=json.dumps(priced),
-                ContentType='application/json'
-            )
-            
-            # Create pre-signed URL for Toolswift to access the file
+            # The pre-signed URL doesn't need the object to exist yet, so
+            # create it up front for Toolswift to access the file
             location_url = s3_client.generate_presigned_url(
                 'get_object',
                 Params={'Bucket': bucket_name, 'Key': s3_key},
                 ExpiresIn=3600  # 1 hour
             )
-            
-            print(f"[Job] Uploaded to S3: s3://{bucket_name}/{s3_key}")
-            print(f"[Job] Generated pre-signed URL: {location_url}")
+            logger.info("[Job] Generated pre-signed URL: %s", location_url)
+
+            # Stream JSON to S3, encoding products as the upload reads them.
+            # boto3 is blocking, so it runs in a worker thread off the event loop
+            upload_task = asyncio.create_task(asyncio.to_thread(
+                s3_client.upload_fileobj,
+                JsonArrayReader(iter_priced_rows(catalog)),
+                bucket_name,
+                s3_key,
+                ExtraArgs={'ContentType': 'application/json'},
+                Config=_catalog_transfer_config()
+            ))
+
+            # Connect to Toolswift while the upload runs; the bulk-upload
+            # request itself must wait until the object exists
+            await aprewarm_toolswift()
+            await upload_task
+            logger.info("[Job] Uploaded to S3: s3://%s/%s", bucket_name, s3_key)
 
             # Start Toolswift upload
-            print("[Job] Starting Toolswift upload (location mode) ...")
-            resp = start_toolswift_upload_with_json(priced, len(priced), location_url=location_url)
-            print(f"[Job] Toolswift upload finished. response_summary={str(resp)[:500]}")
+            logger.info("[Job] Starting Toolswift upload (location mode) ...")
+            resp = await astart_toolswift_upload_with_json(None, count, location_url=location_url)
+            logger.info("[Job] Toolswift upload finished. response_summary=%s", _Capped(resp))
             
         except Exception as e:
-            print(f"[Toolswift] Failed to initiate upload: {e}")
+            logger.error("[Toolswift] Failed to initiate upload: %s", e)
             try:
                 notify_error("Toolswift initiation failed", e)
             except Exception as ne:
-                print(f"[Notify] Failed to send error email: {ne}")
+                logger.error("[Notify] Failed to send error email: %s", ne)
+
+        await notify_task
 
         result = {
-            "count": len(priced),
-            "s3_key": s3_key if 's3_key' in locals() else None,
-            "timestamp": timestamp if 'timestamp' in locals() else None
+            "count": count,
+            "s3_key": s3_key,
+            "timestamp": timestamp
         }
-        print(f"[Job] run_job finished. result={result}")
+        logger.info("[Job] run_job finished. result=%s", result)
         return result
         
     except Exception as e:
-        print(f"[Job] run_job failed: {e}")
+        logger.error("[Job] run_job failed: %s", e)
         try:
             notify_error("Job execution failed", e)
         except Exception as ne:
-            print(f"[Notify] Failed to send error email: {ne}")
+            logger.error("[Notify] Failed to send error email: %s", ne)
         raise
 
 
 def run_now_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Manual job trigger - replaces POST /run-now"""
-    print("[API] /run-now invoked. Running job...")
+    logger.info("[API] /run-now invoked. Running job...")
     
     try:
         result = run_job()
-        print("[API] /run-now finished successfully.")
+        logger.info("[API] /run-now finished successfully.")
         return create_response(200, result)
     except Exception as e:
-        print(f"[API] /run-now failed: {e}")
+        logger.error("[API] /run-now failed: %s", e)
         return create_response(500, {
             "error": "Job execution failed",
             "message": str(e)
@@ -138,7 +242,7 @@ def run_now_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
 def test_email_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Test email function - replaces POST /test-email"""
-    print(f"[API] /test-email called.")
+    logger.info("[API] /test-email called.")
     
     try:
         # Get query parameters
@@ -155,32 +259,37 @@ def test_email_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             to=recipients,
         )
         
-        print("[API] /test-email sent successfully.")
+        logger.info("[API] /test-email sent successfully.")
         return create_response(200, {"ok": True, "summary": result})
         
     except Exception as e:
-        print(f"[API] /test-email failed: {e}")
+        logger.error("[API] /test-email failed: %s", e)
         return create_response(500, {
             "ok": False,
             "error": str(e)
         })
 
 
+@functools.lru_cache(maxsize=1)
+def _describe_rule(rule_name: str, epoch_bucket: int) -> Dict[str, Any]:
+    # epoch_bucket (whole monotonic seconds) only keys the cache, so polling
+    # monitors get at most one EventBridge call per second per container
+    return _events().describe_rule(Name=rule_name)
+
+
 def status_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Status check - replaces GET /status"""
-    print("[API] /status called.")
+    logger.info("[API] /status called.")
     
     try:
         # In Lambda, we don't have an internal scheduler
         # Instead, we check the EventBridge rule
-        events_client = boto3.client('events')
-        
+
         # Try to get the rule information
         try:
-            stack_name = os.environ.get('AWS_LAMBDA_FUNCTION_NAME', '').replace('-StatusFunction', '')
-            rule_name = f"{stack_name}-ScheduledJobRule"
-            
-            response = events_client.describe_rule(Name=rule_name)
+            rule_name = RULE_NAME
+
+            response = _describe_rule(rule_name, int(time.monotonic()))
             
             return create_response(200, {
                 "scheduled": True,
@@ -192,7 +301,7 @@ def status_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             })
             
         except Exception as rule_error:
-            print(f"[Status] Could not get rule info: {rule_error}")
+            logger.warning("[Status] Could not get rule info: %s", rule_error)
             return create_response(200, {
                 "scheduled": True,
                 "message": "Running on EventBridge schedule (rule details unavailable)",
@@ -200,7 +309,7 @@ def status_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             })
             
     except Exception as e:
-        print(f"[API] /status failed: {e}")
+        logger.error("[API] /status failed: %s", e)
         return create_response(500, {
             "error": "Status check failed",
             "message": str(e)
@@ -209,17 +318,17 @@ def status_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
 def scheduled_job_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """EventBridge scheduled job handler - replaces APScheduler"""
-    print("[Scheduled] Scheduled job triggered by EventBridge")
+    logger.info("[Scheduled] Scheduled job triggered by EventBridge")
     
     try:
         result = run_job()
-        print("[Scheduled] Scheduled job completed successfully")
+        logger.info("[Scheduled] Scheduled job completed successfully")
         return {
             "statusCode": 200,
             "body": result
         }
     except Exception as e:
-        print(f"[Scheduled] Scheduled job failed: {e}")
+        logger.error("[Scheduled] Scheduled job failed: %s", e)
         return {
             "statusCode": 500,
             "body": {
@@ -0,0 +1,22 @@
+# hpd/aio.py
+
+import asyncio
+
+# Lambda handlers are synchronous, so coroutines are driven on one long-lived
+# loop; this keeps the shared AsyncClient pools valid across warm invocations
+_loop = asyncio.new_event_loop()
+
+
+def run_sync(coro):
+    """Run a coroutine to completion on the shared event loop.
+
+    Only for synchronous callers: code already running on the loop must
+    await the coroutine (e.g. ``aget_inventory``) instead.
+    """
+    if _loop.is_running():
+        coro.close()
+        raise RuntimeError(
+            "run_sync() called from inside the running event loop; "
+            "await the async variant (e.g. aget_inventory) instead"
+        )
+    return _loop.run_until_complete(coro)
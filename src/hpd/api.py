@@ -1,53 +1,140 @@
 # hpd/api.py
 
+import asyncio
+import atexit
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import fields
+from operator import itemgetter
 import httpx
-import json
-from typing import List, Optional
+import orjson
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .aio import run_sync
 from .auth import generate_auth_header
-from .models import Product
+from .models import Catalog, Product, catalog_from_rows
 
 BASE_URL = "https://api.hpd.ca"
 
+# Shared client so consecutive calls (and warm Lambda invocations) reuse connections
+_CLIENT_KWARGS: Dict[str, Any] = dict(
+    base_url=BASE_URL,
+    http2=True,  # falls back to HTTP/1.1 via ALPN if unsupported
+    timeout=60.0,
+    limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+)
+_client = httpx.Client(**_CLIENT_KWARGS)
+atexit.register(_client.close)
+
+_async_client = httpx.AsyncClient(**_CLIENT_KWARGS)
+atexit.register(lambda: run_sync(_async_client.aclose()))
+
+# Max parts per /get_inventory request, keeps the query string well under URL limits
+INVENTORY_CHUNK_SIZE = 50
+# How long a get_inventory result may be served from cache
+INVENTORY_CACHE_TTL = 60
+INVENTORY_CACHE_MAXSIZE = 256
+# part tuple -> (monotonic insert time, successful envelope), least recently used first
+_inventory_cache: "OrderedDict[Tuple[str, ...], Tuple[float, dict]]" = OrderedDict()
+
+
+def _parse_response(response: httpx.Response):
+    response.raise_for_status()
+
+    content_type = response.headers.get("content-type", "")
+    if "application/json" in content_type:
+        return orjson.loads(response.content)
+    else:
+        return response.text  # return raw HTML or plain text
+
 # Helper to send GET requests
 def get(endpoint: str, query: str = ""):
-    url = f"{BASE_URL}{endpoint}{query}"
     headers = {
         "Authorization": generate_auth_header("GET", endpoint, query)
     }
     try:
-        response = httpx.get(url, headers=headers, timeout=60.0)
-        response.raise_for_status()
-
-        content_type = response.headers.get("content-type", "")
-        if "application/json" in content_type:
-            return response.json()
-        else:
-            return response.text  # return raw HTML or plain text
+        response = _client.get(f"{endpoint}{query}", headers=headers)
+        return _parse_response(response)
     except httpx.RequestError as e:
         print(f"[ERROR] Request failed: {e}")
         return None
 
-# Helper to send POST requests
-def post(endpoint: str, data: dict):
-    body_str = json.dumps(data, sort_keys=True, separators=(",", ":"))
-    query = ""
+# Async variant of get(), for issuing independent requests concurrently
+async def aget(endpoint: str, query: str = ""):
+    headers = {
+        "Authorization": generate_auth_header("GET", endpoint, query)
+    }
+    try:
+        response = await _async_client.get(f"{endpoint}{query}", headers=headers)
+        return _parse_response(response)
+    except httpx.RequestError as e:
+        print(f"[ERROR] Request failed: {e}")
+        return None
+
+def _signed_post(endpoint: str, data: dict) -> Tuple[Dict[str, str], bytes]:
+    # Sign and send the exact same bytes so the body MD5 always matches
+    body_bytes = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
     headers = {
-        "Authorization": generate_auth_header("POST", endpoint, query, body_str),
+        "Authorization": generate_auth_header("POST", endpoint, "", body_bytes.decode()),
         "Content-Type": "application/json"
     }
-    url = f"{BASE_URL}{endpoint}"
-    response = httpx.post(url, headers=headers, json=data, timeout=60.0)
+    return headers, body_bytes
+
+def _post_result(response: httpx.Response):
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
+
+# Helper to send POST requests
+def post(endpoint: str, data: dict):
+    headers, body_bytes = _signed_post(endpoint, data)
+    return _post_result(_client.post(endpoint, headers=headers, content=body_bytes))
+
+# Async variant of post()
+async def apost(endpoint: str, data: dict):
+    headers, body_bytes = _signed_post(endpoint, data)
+    return _post_result(await _async_client.post(endpoint, headers=headers, content=body_bytes))
 
 # API Function: GET /
 def get_root():
     return get("/")
 
 # API Function: GET /get_inventory
-def get_inventory(parts: List[str]):
-    query = "?" + "&".join([f"part={p}" for p in parts])
-    return get("/get_inventory", query)
+def get_inventory(parts: Sequence[str]):
+    """Fetch inventory for ``parts``, served from a short-lived cache.
+
+    Only successful envelopes are cached; each caller gets its own copy.
+    Synchronous entry point: code running on the event loop (e.g. inside
+    ``run_job_async``) must ``await aget_inventory(...)`` instead.
+    """
+    # Sorted, de-duplicated key so overlapping calls in any order share a cache entry
+    key = tuple(sorted(set(parts)))
+    now = time.monotonic()
+    cached = _inventory_cache.get(key)
+    if cached is not None:
+        if now - cached[0] < INVENTORY_CACHE_TTL:
+            _inventory_cache.move_to_end(key)
+            return copy.deepcopy(cached[1])
+        del _inventory_cache[key]
+
+    response = run_sync(aget_inventory(list(key)))
+    if isinstance(response, dict) and response.get("success"):
+        _purge_expired_inventory(now)
+        _inventory_cache.pop(key, None)
+        while len(_inventory_cache) >= INVENTORY_CACHE_MAXSIZE:
+            _inventory_cache.popitem(last=False)
+        _inventory_cache[key] = (now, copy.deepcopy(response))
+    return response
+
+def _purge_expired_inventory(now: float) -> None:
+    expired = [k for k, (inserted, _) in _inventory_cache.items() if now - inserted >= INVENTORY_CACHE_TTL]
+    for k in expired:
+        del _inventory_cache[k]
+
+async def aget_inventory(parts: List[str]):
+    chunks = [parts[i:i + INVENTORY_CHUNK_SIZE] for i in range(0, len(parts), INVENTORY_CHUNK_SIZE)] or [[]]
+    queries = ["?" + "&".join([f"part={p}" for p in chunk]) for chunk in chunks]
+    responses = await asyncio.gather(*[aget("/get_inventory", q) for q in queries])
+    return _merge_chunked_responses(responses)
 
 # API Function: GET /get_parts_on_order
 def get_parts_on_order():
@@ -71,16 +158,65 @@ def get_tracking_info(invoice: Optional[str] = None, order: Optional[str] = None
 
 # API Function: GET /full_catalog
 def get_full_catalog() -> list[Product]:
-    response = get("/full_catalog")
+    return _catalog_from_response(get("/full_catalog"))
 
+# Columnar variant of get_full_catalog, for vectorized pricing
+def get_catalog_columns() -> Catalog:
+    result = unwrap_result(get("/full_catalog"))
+    return catalog_from_rows(result["columns"], result["rows"])
+
+async def aget_catalog_columns() -> Catalog:
+    result = unwrap_result(await aget("/full_catalog"))
+    return catalog_from_rows(result["columns"], result["rows"])
+
+def _catalog_from_response(response: dict) -> list[Product]:
     if not response.get("success"):
         raise ValueError(f"API Error: {response.get('errors')}")
 
     columns = response["result"]["columns"]
     rows = response["result"]["rows"]
     
-    # Map each row into a Product dataclass
-    return [Product(**dict(zip(columns, row))) for row in rows]
+    # Map each row into a Product dataclass, positionally to skip a dict per row
+    col_idx = {c: i for i, c in enumerate(columns)}
+    pick = itemgetter(*[col_idx[f.name] for f in fields(Product)])
+    return [Product(*pick(row)) for row in rows]
+
+def _merge_chunked_responses(responses: list):
+    """Combine the envelopes of a chunked request into a single envelope.
+
+    Follows the single-request contract: if every chunk failed to send the
+    result is ``None``; if any chunk failed, a ``{"success": False}``
+    envelope carrying every chunk's errors is returned.
+    """
+    if len(responses) == 1:
+        return responses[0]
+    if all(r is None for r in responses):
+        return None
+
+    errors = []
+    for r in responses:
+        if r is None:
+            errors.append("Request failed")
+        elif not isinstance(r, dict):
+            errors.append(f"Unexpected non-JSON response: {str(r)[:200]}")
+        elif not r.get("success"):
+            errors.extend(r.get("errors") or ["Unknown error"])
+    if errors:
+        return {"success": False, "errors": errors}
+
+    results = [r["result"] for r in responses]
+    first = results[0]
+    if isinstance(first, dict) and "rows" in first:
+        merged = {**first, "rows": [row for r in results for row in r["rows"]]}
+    elif all(isinstance(r, dict) for r in results):
+        merged = {}
+        for r in results:
+            merged.update(r)
+    elif all(isinstance(r, list) for r in results):
+        merged = [item for r in results for item in r]
+    else:
+        raise ValueError(f"Cannot merge chunked results of type {sorted({type(r).__name__ for r in results})}")
+    return {"success": True, "result": merged}
 
 def unwrap_result(response: dict):
     if response.get("success"):
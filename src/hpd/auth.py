@@ -3,8 +3,7 @@ import time
 import hmac
 import hashlib
 import base64
-import random
-import string
+import secrets
 from dotenv import load_dotenv
 import os
 
@@ -12,26 +11,53 @@ load_dotenv()
 
 APP_ID = os.getenv("HPD_APP_ID")
 API_KEY = os.getenv("HPD_API_KEY")
+# None when unset; generate_auth_header refuses to sign without them
+_APP_ID_BYTES = APP_ID.encode() if APP_ID else None
+_API_KEY_BYTES = API_KEY.encode() if API_KEY else None
+
+# base64(md5(b"")), used for every GET
+_EMPTY_BODY_MD5 = "1B2M2Y8AsgTpgAmY7PhCfg=="
+_EMPTY_BODY_MD5_BYTES = _EMPTY_BODY_MD5.encode("ascii")
+
+# Bound once so the signing path skips the module attribute lookups
+_b64 = base64.b64encode
+_md5 = hashlib.md5
+_hmac_digest = hmac.digest
 
 def generate_nonce(length: int = 16):
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+    # token_urlsafe(n) yields ~1.3n chars, so slicing always leaves `length`
+    return secrets.token_urlsafe(length)[:length]
 
 def md5_base64(content: str) -> str:
     if not content:
-        return "1B2M2Y8AsgTpgAmY7PhCfg=="
-    return base64.b64encode(hashlib.md5(content.encode()).digest()).decode()
+        return _EMPTY_BODY_MD5
+    return _b64(_md5(content.encode()).digest()).decode("ascii")
 
 def generate_auth_header(method: str, path: str, query: str = "", body: str = "") -> str:
+    if _APP_ID_BYTES is None:
+        raise ValueError("HPD_APP_ID is not set in environment variables")
+    if _API_KEY_BYTES is None:
+        raise ValueError("HPD_API_KEY is not set in environment variables")
     method = method.upper()
     path = path.lower()
     timestamp = str(int(time.time()))
     nonce = generate_nonce()
-    body_md5 = md5_base64(body)
-    
-    message = f"{APP_ID}{method}{path}{query}{timestamp}{nonce}{body_md5}"
-    
-    digest = base64.b64encode(
-        hmac.new(API_KEY.encode(), message.encode(), hashlib.sha256).digest()
-    ).decode()
+    # Kept as bytes end to end: b64encode output goes straight into the message
+    body_md5 = _b64(_md5(body.encode()).digest()) if body else _EMPTY_BODY_MD5_BYTES
+
+    message = b"".join((
+        _APP_ID_BYTES,
+        method.encode("ascii"),
+        path.encode(),
+        query.encode(),
+        timestamp.encode("ascii"),
+        nonce.encode("ascii"),
+        body_md5,
+    ))
+
+    # hmac.digest is the one-shot OpenSSL path (SHA-NI where the CPU has it)
+    digest = _b64(
+        _hmac_digest(_API_KEY_BYTES, message, "sha256")
+    ).decode("ascii")
 
     return f"smx {APP_ID}:{digest}:{timestamp}:{nonce}"
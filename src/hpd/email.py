@@ -17,9 +17,13 @@ Environment variables:
 
 from __future__ import annotations
 
+import atexit
+import functools
 import os
 import smtplib
 import socket
+import threading
+import time
 import traceback
 from typing import Iterable, List, Optional, Sequence
 
@@ -78,6 +82,108 @@ class SmtpConfig:
             raise RuntimeError("NOTIFY_EMAIL_FROM or SMTP_USERNAME must be set")
 
 
+@functools.lru_cache(maxsize=1)
+def _smtp_config() -> SmtpConfig:
+    return SmtpConfig()
+
+
+def refresh_smtp_config() -> None:
+    """Drop the cached SmtpConfig so the next send re-reads the environment."""
+    _smtp_config.cache_clear()
+
+
+# Past this idle time a cached connection is assumed dropped (frozen Lambda,
+# NAT/server idle timeouts) and replaced without probing it, since a NOOP on
+# a silently dead socket blocks for the full socket timeout
+SMTP_SESSION_MAX_IDLE = 60
+
+
+class SmtpSession:
+    """A connected (and logged-in) SMTP server that is reused across sends."""
+
+    def __init__(self, config: SmtpConfig) -> None:
+        self.key = _session_key(config)
+        self.last_used = time.monotonic()
+        if config.use_ssl:
+            self.server = smtplib.SMTP_SSL(config.host, config.port, timeout=30)
+        else:
+            self.server = smtplib.SMTP(config.host, config.port, timeout=30)
+
+        try:
+            self.server.ehlo()
+            if not config.use_ssl and config.use_tls:
+                try:
+                    self.server.starttls()
+                    self.server.ehlo()
+                except smtplib.SMTPException:
+                    # Proceed without TLS if server doesn't support it
+                    pass
+
+            if config.username:
+                self.server.login(config.username, config.password)
+        except Exception:
+            self.close()
+            raise
+
+    def is_idle(self) -> bool:
+        return time.monotonic() - self.last_used > SMTP_SESSION_MAX_IDLE
+
+    def is_alive(self) -> bool:
+        if self.is_idle():
+            return False
+        try:
+            return self.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def send_message(self, msg: EmailMessage, *, from_addr: str, to_addrs: Sequence[str]) -> None:
+        self.server.send_message(msg, from_addr=from_addr, to_addrs=list(to_addrs))
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        if self.is_idle():
+            # Don't wait on QUIT over a connection that is likely gone
+            self.server.close()
+            return
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+
+
+_session: Optional[SmtpSession] = None
+_session_lock = threading.Lock()
+
+
+def _session_key(config: SmtpConfig) -> tuple:
+    return (config.host, config.port, config.username, config.password, config.use_ssl, config.use_tls)
+
+
+def _get_or_open_session(config: SmtpConfig, *, force_new: bool = False) -> SmtpSession:
+    """Return the cached session, reconnecting if it is stale or the config changed.
+
+    Must be called with _session_lock held.
+    """
+    global _session
+    if _session is not None and not force_new and _session.key == _session_key(config) and _session.is_alive():
+        return _session
+
+    close_smtp_session()
+    _session = SmtpSession(config)
+    return _session
+
+
+def close_smtp_session() -> None:
+    """Close the cached SMTP connection, if any."""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+
+atexit.register(close_smtp_session)
+
+
 def _build_message(
     subject: str,
     body_text: str,
@@ -129,7 +235,7 @@ def send_email(
     """
     print(f"[Email] Sending email: {subject}")
 
-    config = SmtpConfig()
+    config = _smtp_config()
     config.validate()
 
     # Debug credentials (masked by default; enable full dump via SMTP_DEBUG_SHOW_PASSWORD=true)
@@ -165,26 +271,15 @@ def send_email(
 
     all_rcpt = list(recipients_to) + list(recipients_cc) + list(recipients_bcc)
 
-    if config.use_ssl:
-        server_factory = lambda: smtplib.SMTP_SSL(config.host, config.port, timeout=30)
-    else:
-        server_factory = lambda: smtplib.SMTP(config.host, config.port, timeout=30)
-
     try:
-        with server_factory() as server:
-            server.ehlo()
-            if not config.use_ssl and config.use_tls:
-                try:
-                    server.starttls()
-                    server.ehlo()
-                except smtplib.SMTPException:
-                    # Proceed without TLS if server doesn't support it
-                    pass
-
-            if config.username:
-                server.login(config.username, config.password)
-
-            server.send_message(msg, from_addr=config.mail_from, to_addrs=all_rcpt)
+        with _session_lock:
+            session = _get_or_open_session(config)
+            try:
+                session.send_message(msg, from_addr=config.mail_from, to_addrs=all_rcpt)
+            except smtplib.SMTPServerDisconnected:
+                # Server dropped the idle connection between the health check and the send
+                session = _get_or_open_session(config, force_new=True)
+                session.send_message(msg, from_addr=config.mail_from, to_addrs=all_rcpt)
     except (smtplib.SMTPException, OSError, socket.error) as exc:
         raise RuntimeError(f"Failed to send email: {exc}") from exc
 
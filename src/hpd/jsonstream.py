@@ -0,0 +1,49 @@
+import io
+from typing import Any, Iterable, Iterator
+
+import orjson
+
+_dumps = orjson.dumps
+
+
+def iter_json_array(rows: Iterable[Any]) -> Iterator[bytes]:
+    """Yield the JSON encoding of `rows` as one array, a row at a time."""
+    yield b"["
+    separator = b""
+    for row in rows:
+        yield separator
+        yield _dumps(row)
+        separator = b","
+    yield b"]"
+
+
+class JsonArrayReader(io.RawIOBase):
+    """Readable binary stream over iter_json_array(rows).
+
+    Rows are encoded only as the consumer reads, so the full JSON document is
+    never held in memory. Each read fills the requested size unless the array
+    is exhausted, which is what multipart uploaders expect.
+    """
+
+    def __init__(self, rows: Iterable[Any]) -> None:
+        super().__init__()
+        self._chunks = iter_json_array(rows)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        written = 0
+        while written < len(view):
+            if not self._pending:
+                try:
+                    self._pending = memoryview(next(self._chunks))
+                except StopIteration:
+                    break
+            n = min(len(view) - written, len(self._pending))
+            view[written:written + n] = self._pending[:n]
+            self._pending = self._pending[n:]
+            written += n
+        return written
@@ -1,8 +1,10 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, List, Optional, Sequence
 from datetime import datetime
 
-@dataclass
+import numpy as np
+
+@dataclass(slots=True)
 class Product:
     PartNumber: str
     Description: str
@@ -20,3 +22,42 @@ class Product:
     Manufacturer: str
     ETA: Optional[str]
     Price: float
+
+
+# Column-oriented catalog: one row-aligned NumPy array per Product field.
+# Pricing only scans a handful of numeric columns, which stay contiguous here.
+Catalog = Dict[str, np.ndarray]
+
+PRODUCT_FIELDS = tuple(f.name for f in fields(Product))
+# Inventory counts are exact in float32 (integers up to 2**24); money stays
+# float64 so floor(price * factor) matches the scalar pricing exactly
+INVENTORY_COLUMNS = ("Available", "OnOrder")
+PRICE_COLUMNS = ("CADmap", "USDmap", "Price")
+BOOL_COLUMNS = ("Discontinued",)
+
+
+def _column(name: str, values: Sequence) -> np.ndarray:
+    # None becomes NaN in the float columns
+    if name in INVENTORY_COLUMNS:
+        return np.array(values, dtype=np.float32)
+    if name in PRICE_COLUMNS:
+        return np.array(values, dtype=np.float64)
+    if name in BOOL_COLUMNS:
+        return np.array(values, dtype=bool)
+    return np.array(values, dtype=object)
+
+
+def catalog_from_rows(columns: List[str], rows: List[list]) -> Catalog:
+    """Build a Catalog from the HPD /full_catalog columns/rows payload."""
+    col_idx = {c: i for i, c in enumerate(columns)}
+    data = list(zip(*rows)) if rows else [()] * len(columns)
+    return {name: _column(name, data[col_idx[name]]) for name in PRODUCT_FIELDS}
+
+
+def catalog_from_products(products: Iterable[Product]) -> Catalog:
+    products = list(products)
+    return {name: _column(name, [getattr(p, name) for p in products]) for name in PRODUCT_FIELDS}
+
+
+def catalog_size(catalog: Catalog) -> int:
+    return len(catalog["PartNumber"])
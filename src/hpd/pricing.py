@@ -1,7 +1,9 @@
 from math import floor
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 
-from .models import Product
+import numpy as np
+
+from .models import Catalog, Product, catalog_from_products
 
 
 def compute_final_price(product: Product) -> float:
@@ -19,16 +21,17 @@ def compute_final_price(product: Product) -> float:
     cost_price = product.Price
 
     # If CAD map is present, use it by rounding up to .99 and skip margin enforcement
-    if cad_map is not None and cad_map > 0:
-        return round(floor(cad_map) + 0.99, 2)
+    cad_cents = _price_cents(cad_map, 1)
+    if cad_cents is not None:
+        return cad_cents / 100
 
     # Otherwise proceed with USD or cost-based pricing and enforce minimum margin
-    conv_usd = (floor(usd_map * 1.4) + 0.99) if (usd_map is not None and usd_map > 0) else None
-    conv_cost = (floor(cost_price * 1.75) + 0.99) if (cost_price is not None and cost_price > 0) else None
+    conv_usd = _price_cents(usd_map, 1.4)
+    conv_cost = _price_cents(cost_price, 1.75)
 
-    base_price = next((v for v in (conv_usd, conv_cost) if v is not None), None)
+    base_price = conv_usd if conv_usd is not None else conv_cost
 
-    min_margin = (floor(cost_price * 1.3) + 0.99) if (cost_price is not None and cost_price > 0) else None
+    min_margin = _price_cents(cost_price, 1.3)
 
     if base_price is not None and min_margin is not None and base_price < min_margin:
         final_price = min_margin
@@ -37,7 +40,54 @@ def compute_final_price(product: Product) -> float:
 
     if final_price is None:
         return 0.0
-    return round(final_price, 2)
+    return final_price / 100
+
+
+def _price_cents(amount: Optional[float], factor: float) -> Optional[int]:
+    """floor(amount * factor) dollars plus 99 cents, as integer cents.
+
+    Working in cents keeps the .99 exact; dividing by 100 once at the end
+    yields the same value round(floor(...) + 0.99, 2) used to produce.
+    Returns None when the amount is missing or not positive.
+    """
+    if amount is None or amount <= 0:
+        return None
+    return floor(amount * factor) * 100 + 99
+
+
+def compute_final_prices_vec(cad: np.ndarray, usd: np.ndarray, cost: np.ndarray) -> np.ndarray:
+    """Vectorized compute_final_price over columns of CADmap, USDmap and cost.
+
+    Missing values are expected as NaN. Follows the same precedence as the
+    scalar version: CAD map wins, else USD map, else cost, with the minimum
+    margin enforced on the non-CAD paths and 0.0 when nothing is usable.
+    """
+
+    with np.errstate(invalid="ignore"):
+        has_cad = cad > 0
+        has_usd = usd > 0
+        has_cost = cost > 0
+
+        # Every branch is floor(amount * factor) dollars + 99 cents, and
+        # "+ 99 cents" is monotonic, so pick/compare whole dollars first and
+        # convert once. fmax ignores the NaN margin when cost is missing; a
+        # non-positive cost gives a margin <= 0, which never wins either.
+        dollars = np.where(has_usd, np.floor(usd * 1.4), np.floor(cost * 1.75))
+        np.fmax(dollars, np.floor(cost * 1.3), out=dollars)
+        np.copyto(dollars, np.floor(cad), where=has_cad)
+
+        # Whole cents held in float64 (exact below 2**53), divided once at the end
+        dollars *= 100
+        dollars += 99
+        dollars /= 100
+        valid = has_cad | has_usd | has_cost
+
+    return np.where(valid, dollars, 0.0)
+
+
+def price_catalog(catalog: Catalog) -> Catalog:
+    """Return the catalog with a "Final Price" column appended."""
+    return {**catalog, "Final Price": compute_final_prices_vec(catalog["CADmap"], catalog["USDmap"], catalog["Price"])}
 
 
 def compute_priced_catalog(products: List[Product]) -> List[Dict[str, object]]:
@@ -66,15 +116,33 @@ def compute_priced_catalog(products: List[Product]) -> List[Dict[str, object]]:
     #     }
     #     for p in products
     # ]
-    return [
-        {
-            "Final Price": compute_final_price(p),
-            "Inventory": {"Online Store": int(p.Available)},
-            "Cost Price": p.Price,
-            "Retail Price": compute_final_price(p),
-            "Is Active": not p.Discontinued,
-            "SKU": p.PartNumber,   
-        }
-        for p in products
-    ]
+    return list(iter_priced_catalog(products))
+
 
+def iter_priced_catalog(products: List[Product]) -> Iterator[Dict[str, object]]:
+    """Lazily yield the rows of compute_priced_catalog, e.g. to stream them into an upload."""
+    return iter_priced_rows(catalog_from_products(products))
+
+
+def iter_priced_rows(catalog: Catalog) -> Iterator[Dict[str, object]]:
+    """Price a columnar Catalog in one vectorized pass, then yield output rows lazily."""
+
+    priced = price_catalog(catalog)
+
+    # Columns are converted to Python values only here, at the JSON boundary
+    for sku, available, cost, discontinued, price in zip(
+        priced["PartNumber"].tolist(),
+        priced["Available"].tolist(),
+        priced["Price"].tolist(),
+        priced["Discontinued"].tolist(),
+        priced["Final Price"].tolist(),
+    ):
+        yield {
+            "Final Price": price,
+            "Inventory": {"Online Store": int(available)},
+            # Missing costs are NaN in the float column; emit None like the row path did
+            "Cost Price": None if cost != cost else cost,
+            "Retail Price": price,
+            "Is Active": not discontinued,
+            "SKU": sku,
+        }
@@ -1,24 +1,37 @@
+import atexit
+import functools
+import io
 import os
-from typing import Optional, Any, Dict, List, Union
+from typing import Optional, Any, Dict, List, Tuple, Union, BinaryIO
 
 import httpx
+import orjson
 from dotenv import load_dotenv
 
+from .aio import run_sync
+
 
 load_dotenv()
 
 TOOLSWIFT_API_BASE = "https://api.toolswift.ca/"
 # TOOLSWIFT_LIVE_URL = "https://app.toolswift.ca"
 
-def upload_and_return_url(
-	file_path: Optional[str] = None,
-	*,
-	filename: str = "products.json",
-	content: Optional[Union[bytes, str]] = None,
-) -> str:
-	print(f"[Toolswift] upload_and_return_url started. file_path={file_path}")
-
-
+# Shared client so the upload and the bulk-upload trigger reuse one connection
+# (multiplexed over HTTP/2 when the server negotiates it)
+_CLIENT_KWARGS: Dict[str, Any] = dict(
+	http2=True,
+	timeout=120.0,
+	limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=120),
+)
+_client = httpx.Client(**_CLIENT_KWARGS)
+atexit.register(_client.close)
+_async_client = httpx.AsyncClient(**_CLIENT_KWARGS)
+atexit.register(lambda: run_sync(_async_client.aclose()))
+
+
+@functools.lru_cache(maxsize=1)
+def _toolswift_config() -> Tuple[str, str, str]:
+	"""Read (api_base, store_key, bearer_token) from the environment once."""
 	api_base = (
 		os.getenv("TOOLSWIFT_URL")
 		or os.getenv("TOOLSWIFT_API_BASE")
@@ -30,30 +43,43 @@ def upload_and_return_url(
 		raise ValueError("TOOLSWIFT_STORE_KEY is not set in environment variables")
 	if not bearer_token:
 		raise ValueError("TOOLSWIFT_BEARER_TOKEN is not set in environment variables")
+	return api_base, store_key, bearer_token
 
-	url = f"{api_base}/file-proccesor/"
-	headers = {
+
+def refresh_toolswift_config() -> None:
+	"""Drop the cached Toolswift settings so the next call re-reads the environment."""
+	_toolswift_config.cache_clear()
+
+def _auth_headers() -> Tuple[str, Dict[str, str]]:
+	api_base, store_key, bearer_token = _toolswift_config()
+	return api_base, {
 		"x-store-key": store_key,
 		"Authorization": f"Bearer {bearer_token}",
 	}
 
-	print(f"[Toolswift] Uploading file to {url} ...")
-	if content is not None:
-		data_bytes = content.encode("utf-8") if isinstance(content, str) else content
-		files = {"file": (filename, data_bytes, "application/json")}
-		resp = httpx.post(url, headers=headers, files=files, timeout=120.0)
-		resp.raise_for_status()
-	else:
-		if not file_path:
-			raise ValueError("Either file_path or content must be provided")
-		filename = os.path.basename(file_path)
-		with open(file_path, "rb") as fh:
-			files = {"file": (filename, fh, "application/json")}
-			resp = httpx.post(url, headers=headers, files=files, timeout=120.0)
-			resp.raise_for_status()
 
+def _open_upload_file(
+	file_path: Optional[str],
+	filename: str,
+	content: Optional[Union[bytes, str, BinaryIO]],
+) -> Tuple[str, BinaryIO, bool]:
+	"""Resolve upload inputs to (filename, stream, whether we own the stream)."""
+	if content is not None:
+		if isinstance(content, str):
+			content = content.encode("utf-8")
+		# A file-like part is streamed by httpx in chunks instead of being
+		# copied into the multipart body; BytesIO shares the bytes buffer
+		if isinstance(content, (bytes, bytearray)):
+			return filename, io.BytesIO(content), True
+		return filename, content, False
+	if not file_path:
+		raise ValueError("Either file_path or content must be provided")
+	return os.path.basename(file_path), open(file_path, "rb"), True
+
+
+def _location_from_upload(resp: httpx.Response) -> str:
 	try:
-		payload = resp.json()
+		payload = orjson.loads(resp.content)
 	except Exception:
 		print(f"[Toolswift] Unexpected non-JSON response: {resp.text[:500]}")
 		raise
@@ -66,39 +92,74 @@ def upload_and_return_url(
 	return location
 
 
-def start_toolswift_upload_with_json(
-	priced_catalog: List[Dict[str, Any]],
-	product_count: int,
-	location_url: str = None,
-) -> Dict[str, Any]:
-	print(f"[Toolswift] start_toolswift_upload_with_json started. product_count={product_count}")
+def upload_and_return_url(
+	file_path: Optional[str] = None,
+	*,
+	filename: str = "products.json",
+	content: Optional[Union[bytes, str, BinaryIO]] = None,
+) -> str:
+	print(f"[Toolswift] upload_and_return_url started. file_path={file_path}")
 
-	api_base = (
-		os.getenv("TOOLSWIFT_URL")
-		or os.getenv("TOOLSWIFT_API_BASE")
-		or TOOLSWIFT_LIVE_URL
-	).rstrip("/")
-	store_key = os.getenv("TOOLSWIFT_STORE_KEY")
-	bearer_token = os.getenv("TOOLSWIFT_BEARER_TOKEN")
-	if not store_key:
-		raise ValueError("TOOLSWIFT_STORE_KEY is not set in environment variables")
-	if not bearer_token:
-		raise ValueError("TOOLSWIFT_BEARER_TOKEN is not set in environment variables")
+	api_base, headers = _auth_headers()
+	url = f"{api_base}/file-proccesor/"
 
-	headers = {
-		"x-store-key": store_key,
-		"Authorization": f"Bearer {bearer_token}",
-		"Content-Type": "application/json",
-	}
+	print(f"[Toolswift] Uploading file to {url} ...")
+	filename, stream, owned = _open_upload_file(file_path, filename, content)
+	try:
+		files = {"file": (filename, stream, "application/json")}
+		resp = _client.post(url, headers=headers, files=files)
+		resp.raise_for_status()
+	finally:
+		if owned:
+			stream.close()
+
+	return _location_from_upload(resp)
+
+
+async def aprewarm_toolswift() -> None:
+	"""Open a pooled connection to Toolswift ahead of the real request (best effort)."""
+	try:
+		api_base, _ = _auth_headers()
+		# Short timeout: a slow Toolswift must not hold the job up before the upload
+		await _async_client.head(api_base, timeout=5.0)
+	except Exception:
+		pass  # the real request will connect (and report errors) on its own
+
+
+def _bulk_upload_request(location_url: Optional[str], product_count: int) -> Tuple[str, Dict[str, str], bytes]:
+	print(f"[Toolswift] start_toolswift_upload_with_json started. product_count={product_count}")
+	api_base, headers = _auth_headers()
+	headers["Content-Type"] = "application/json"
 	url = f"{api_base}/products/json-bulk-upload"
 	payload = {
 			"Location": location_url,
 			"upsert": True ,
 		}
 	print("[Toolswift] Sending location payload to Toolswift API ...")
-	response = httpx.post(url, headers=headers, json=payload, timeout=120.0)
+	return url, headers, orjson.dumps(payload)
+
+
+def _bulk_upload_result(response: httpx.Response) -> Dict[str, Any]:
 	response.raise_for_status()
 	print("[Toolswift] Upload request accepted by Toolswift API")
 	print(f"[Toolswift] start_toolswift_upload_with_json finished (location mode).")
-	return response.json()
+	return orjson.loads(response.content)
+
+
+def start_toolswift_upload_with_json(
+	priced_catalog: Optional[List[Dict[str, Any]]],
+	product_count: int,
+	location_url: str = None,
+) -> Dict[str, Any]:
+	url, headers, body = _bulk_upload_request(location_url, product_count)
+	return _bulk_upload_result(_client.post(url, headers=headers, content=body))
 
+
+async def astart_toolswift_upload_with_json(
+	priced_catalog: Optional[List[Dict[str, Any]]],
+	product_count: int,
+	location_url: str = None,
+) -> Dict[str, Any]:
+	"""Async variant of start_toolswift_upload_with_json on the shared AsyncClient."""
+	url, headers, body = _bulk_upload_request(location_url, product_count)
+	return _bulk_upload_result(await _async_client.post(url, headers=headers, content=body))